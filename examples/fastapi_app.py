@@ -1,17 +1,49 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
 from tracenest import logger
 from tracenest.fastapi.middleware import TraceNestMiddleware
 from tracenest.ui.router import router as tracenest_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop = asyncio.get_running_loop()
+    loop_type = type(loop)
+    logger.info(
+        "Event loop selected",
+        loop=f"{loop_type.__module__}.{loop_type.__qualname__}",
+    )
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Attach TraceNest
 app.add_middleware(TraceNestMiddleware)
 app.include_router(tracenest_router)
 
+# Compress log tails served by the UI (plain text shrinks well)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 @app.get("/")
 def root():
     logger.info("Root endpoint hit")
     return {"ok": True}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop + httptools come with: pip install "uvicorn[standard]"
+    uvicorn.run(
+        "fastapi_app:app",
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count() or 1,
+    )
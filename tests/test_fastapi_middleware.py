@@ -75,7 +75,7 @@ def test_request_success_is_logged(monkeypatch):
     assert data["meta"]["method"] == "GET"
     assert data["meta"]["path"] == "/ok"
     assert data["meta"]["status_code"] == 200
-    assert "duration_ms" in data["meta"]
+    assert isinstance(data["meta"]["duration_us"], int)
     assert "trace_id" in data
 
 
@@ -122,3 +122,19 @@ def test_trace_id_is_consistent_per_request(monkeypatch):
     second = json.loads(cap.lines[1])["trace_id"]
 
     assert first != second
+
+
+def test_excluded_prefixes_are_not_logged(monkeypatch):
+    cap = _install_capture_writer(monkeypatch)
+    app, _ = _build_app()
+
+    @app.get("/tracenest/api/logs")
+    def ui_api():
+        return {"logs": []}
+
+    client = TestClient(app)
+
+    res = client.get("/tracenest/api/logs")
+    assert res.status_code == 200
+
+    assert cap.lines == []
@@ -54,3 +54,176 @@ def test_exception_is_serialized():
     data = json.loads(line)
     assert "exc" in data
     assert "stack" in data["exc"]
+    assert data["exc"]["truncated"] is False
+
+
+def test_deep_exception_stack_is_marked_truncated():
+    from tracenest.core.config import MAX_EXCEPTION_STACK_FRAMES
+
+    def recurse(n):
+        if n == 0:
+            raise ValueError("deep")
+        recurse(n - 1)
+
+    try:
+        recurse(MAX_EXCEPTION_STACK_FRAMES * 2)
+    except Exception as e:
+        line = format_log(level="error", message="deep", exception=e)
+
+    data = json.loads(line)
+    assert data["exc"]["truncated"] is True
+
+
+def test_nested_non_string_keys_are_serialized():
+    line = format_log(
+        level="info",
+        message="nested",
+        metadata={"counts": {1: "a", 2: "b"}},
+    )
+
+    data = json.loads(line)
+    assert data["meta"]["counts"] == {"1": "a", "2": "b"}
+
+
+def test_timestamp_matches_configured_format():
+    from datetime import datetime, timezone
+
+    from tracenest.core.config import TIMESTAMP_FORMAT
+
+    data = json.loads(format_log(level="info", message="ts"))
+
+    parsed = datetime.strptime(data["ts"], TIMESTAMP_FORMAT)
+    parsed = parsed.replace(tzinfo=timezone.utc)
+    assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 5
+
+
+def test_metadata_with_failing_str_is_safe():
+    class Hostile:
+        def __str__(self):
+            raise RuntimeError("no str for you")
+
+    line = format_log(
+        level="info",
+        message="hostile",
+        metadata={"bad": Hostile(), "ok": 1},
+    )
+
+    data = json.loads(line)
+    assert data["meta"]["bad"] == "<unserializable>"
+    assert data["meta"]["ok"] == 1
+
+
+def test_primitive_metadata_still_respects_size_limit():
+    from tracenest.core.config import MAX_METADATA_SIZE
+
+    metadata = {f"k{i}": "v" * 100 for i in range(MAX_METADATA_SIZE // 100 + 5)}
+    data = json.loads(format_log(level="info", message="big", metadata=metadata))
+
+    assert 0 < len(data["meta"]) < len(metadata)
+    assert sum(len(k) + len(v) for k, v in data["meta"].items()) <= MAX_METADATA_SIZE
+
+
+def test_nested_unencodable_keys_only_replace_that_value():
+    line = format_log(
+        level="info",
+        message="tuple keys",
+        metadata={"pair": {(1, 2): "x"}, "ok": 1},
+        trace_id="abc",
+    )
+
+    data = json.loads(line)
+    assert data["msg"] == "tuple keys"
+    assert data["trace_id"] == "abc"
+    assert data["meta"]["pair"] == "{(1, 2): 'x'}"
+    assert data["meta"]["ok"] == 1
+
+
+def test_cyclic_metadata_value_is_stringified(monkeypatch):
+    from tracenest.core import formatter
+
+    cyclic = []
+    cyclic.append(cyclic)
+
+    # Same result whichever encoder is installed
+    for encoder in (formatter.orjson, None):
+        monkeypatch.setattr(formatter, "orjson", encoder)
+
+        data = json.loads(
+            format_log(level="info", message="cycle", metadata={"c": cyclic, "ok": 1})
+        )
+        assert data["msg"] == "cycle"
+        assert data["meta"] == {"c": "[[...]]", "ok": 1}
+
+
+def test_oversized_multibyte_record_stays_valid_json():
+    from tracenest.core.config import MAX_LOG_RECORD_SIZE_BYTES
+
+    line = format_log(
+        level="info",
+        message="日本語" * 3300,
+        exception=ValueError("é" * 12000),
+    )
+
+    data = json.loads(line)
+    assert len(line.encode("utf-8")) <= MAX_LOG_RECORD_SIZE_BYTES
+    assert data["msg"].startswith("日本語")
+    assert data["exc"]["truncated"] is True
+
+
+def test_format_log_source_points_at_caller():
+    def caller():
+        return format_log(level="info", message="where", include_source=True)
+
+    data = json.loads(caller())
+    assert data["src"]["file"] == __file__
+    assert data["src"]["function"] == "caller"
+
+
+def test_output_does_not_depend_on_encoder(monkeypatch):
+    import dataclasses
+    import datetime as dt
+    import enum
+    import uuid
+    from decimal import Decimal
+
+    from tracenest.core import formatter
+
+    @dataclasses.dataclass
+    class Point:
+        x: int
+
+    class Color(enum.Enum):
+        RED = "red"
+
+    metadata = {
+        "when": dt.datetime(2024, 1, 2, 3, 4, 5),
+        "day": dt.date(2024, 1, 2),
+        "point": Point(1),
+        "id": uuid.UUID(int=1),
+        "price": Decimal("1.10"),
+        "color": Color.RED,
+        "nan": float("nan"),
+        "nested": [1.5, float("inf")],
+        "pair": (1, 2),
+        "raw": b"ab",
+    }
+
+    def encoded(meta):
+        data = json.loads(format_log(level="info", message="m", metadata=meta))
+        data["meta"].pop("big", None)
+        return json.dumps(data["meta"])
+
+    results = set()
+    for encoder in (formatter.orjson, None):
+        monkeypatch.setattr(formatter, "orjson", encoder)
+        results.add(encoded(metadata))
+        # A >64-bit int sends the whole record to stdlib json
+        results.add(encoded({**metadata, "big": 2**70}))
+
+    assert len(results) == 1
+    meta = json.loads(results.pop())
+    assert meta["when"] == "2024-01-02 03:04:05"
+    assert meta["point"].endswith("Point(x=1)")
+    assert meta["color"] == "red"
+    assert meta["nan"] is None
+    assert meta["nested"] == [1.5, None]
@@ -137,3 +137,13 @@ def test_thread_safety_under_concurrency(monkeypatch):
         t.join()
 
     assert len(cap.lines) == 500
+
+
+def test_include_source_points_at_caller(monkeypatch):
+    cap = _install_capture_writer(monkeypatch)
+
+    logger.log("info", "where", include_source=True)
+
+    data = json.loads(cap.lines[0])
+    assert data["src"]["file"] == __file__
+    assert data["src"]["function"] == "test_include_source_points_at_caller"
@@ -98,3 +98,22 @@ def test_rotation_handles_missing_file_gracefully(tmp_path):
 
     archive_dir = tmp_path / ARCHIVE_DIR_NAME
     assert not archive_dir.exists()
+
+
+def test_rotation_index_follows_highest_archive(tmp_path):
+    archive_dir = tmp_path / ARCHIVE_DIR_NAME
+    archive_dir.mkdir(parents=True)
+
+    # Gap at index 1; the next archive must still come after index 2
+    _write_bytes(archive_dir / f"2026-01-01_2{LOG_FILE_EXTENSION}", 10)
+
+    log_file = tmp_path / f"2026-01-01{LOG_FILE_EXTENSION}"
+    _write_bytes(log_file, MAX_LOG_FILE_SIZE_BYTES + 1)
+
+    rotate_if_needed(log_file)
+
+    archived = sorted(p.name for p in archive_dir.iterdir())
+    assert archived == [
+        f"2026-01-01_2{LOG_FILE_EXTENSION}",
+        f"2026-01-01_3{LOG_FILE_EXTENSION}",
+    ]
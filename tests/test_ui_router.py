@@ -0,0 +1,335 @@
+import asyncio
+import os
+import random
+import time
+from collections import OrderedDict
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tracenest.ui import router as router_module
+
+
+# ---------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    """
+    Points the router at an empty TraceNestLogs/ under tmp_path.
+
+    LOG_DIR is resolved at import, so it is patched alongside the
+    cwd; module caches are reset so tests never see each other's files.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    root = tmp_path / "TraceNestLogs"
+    root.mkdir()
+
+    monkeypatch.setattr(router_module, "LOG_DIR", root)
+    monkeypatch.setattr(router_module, "_LOG_DIR_STR", str(root))
+    monkeypatch.setattr(router_module, "_LIST_CACHE", None)
+    monkeypatch.setattr(router_module, "_TAIL_CACHE", OrderedDict())
+    monkeypatch.setattr(router_module, "_TAIL_CACHE_BYTES", 0)
+    monkeypatch.setattr(router_module, "_FD_SWEEP_TIMER", None)
+
+    yield root
+
+    timer = router_module._FD_SWEEP_TIMER
+    if timer is not None:
+        timer.cancel()
+
+    with router_module._FD_CACHE_LOCK:
+        while router_module._FD_CACHE:
+            _, (fd, _, _) = router_module._FD_CACHE.popitem()
+            os.close(fd)
+
+
+def _build_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router_module.router)
+    return TestClient(app)
+
+
+def _random_lines(rng: random.Random, count: int) -> list:
+    return [
+        ("x" * rng.randint(0, 300) + "\n").encode()
+        for _ in range(count)
+    ]
+
+
+# ---------------------------------------------------------------------
+# Tail reading
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize("line_count", [0, 1, 7, 300, 5_000])
+def test_tail_matches_readlines(log_dir, line_count):
+    rng = random.Random(line_count)
+    path = log_dir / "app.log"
+
+    # Large counts span several (doubling) read blocks
+    data = b"".join(_random_lines(rng, line_count))
+    if line_count and rng.random() < 0.5:
+        data += b"no trailing newline"
+    path.write_bytes(data)
+
+    with open(path, "rb") as f:
+        expected = f.readlines()
+
+    for limit in (1, 2, 10, 499, 4_999, 10_000):
+        tail = router_module._read_log_tail("app.log", limit)
+        assert tail == expected[-limit:]
+
+
+def test_tail_api_returns_last_lines(log_dir):
+    (log_dir / "app.log").write_text("a\nb\nc\n")
+
+    res = _build_client().get("/tracenest/api/logs/app.log?limit=2")
+
+    assert res.status_code == 200
+    assert res.json() == {"file": "app.log", "lines": ["b\n", "c\n"]}
+
+
+def test_stream_returns_raw_tail(log_dir):
+    (log_dir / "app.log").write_text("a\nb\nc\n")
+
+    res = _build_client().get("/tracenest/api/logs/app.log/stream?limit=2")
+
+    assert res.status_code == 200
+    assert res.text == "b\nc\n"
+    assert res.headers["content-type"].startswith("text/plain")
+
+
+# ---------------------------------------------------------------------
+# File name and file type checks
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "filename",
+    ["../secret.log", "..", ".hidden.log", "sub/app.log", "app.txt"],
+)
+def test_unsafe_names_are_rejected(log_dir, filename):
+    (log_dir.parent / "secret.log").write_text("secret\n")
+    (log_dir / ".hidden.log").write_text("hidden\n")
+
+    assert router_module._read_log_tail(filename, 10) == []
+
+
+def test_symlinked_log_is_refused(log_dir):
+    target = log_dir.parent / "outside.txt"
+    target.write_text("secret\n")
+    (log_dir / "evil.log").symlink_to(target)
+
+    res = _build_client().get("/tracenest/api/logs/evil.log")
+
+    assert res.json()["lines"] == []
+
+    listing = _build_client().get("/tracenest/api/logs").json()
+    assert "evil.log" not in listing["logs"]
+
+
+def test_listing_is_newest_first_and_tracks_changes(log_dir):
+    (log_dir / "2026-01-01.log").write_text("")
+    (log_dir / "2026-01-02.log").write_text("")
+    (log_dir / "notes.txt").write_text("")
+
+    client = _build_client()
+    assert client.get("/tracenest/api/logs").json() == {
+        "logs": ["2026-01-02.log", "2026-01-01.log"]
+    }
+
+    (log_dir / "2026-01-03.log").write_text("")
+    os.utime(log_dir, ns=(0, os.stat(log_dir).st_mtime_ns + 1_000_000_000))
+
+    assert client.get("/tracenest/api/logs").json()["logs"][0] == "2026-01-03.log"
+
+
+def test_listing_only_offers_servable_names(log_dir):
+    for name in ("app.log", "my app.log", ".hidden.log", "é.log", "x" * 130 + ".log"):
+        (log_dir / name).write_text("line\n")
+
+    client = _build_client()
+    assert client.get("/tracenest/api/logs").json()["logs"] == ["app.log"]
+
+    # Anything the listing leaves out is refused before any I/O or caching
+    res = client.get("/tracenest/api/logs/my app.log")
+    assert res.json() == {"file": "my app.log", "lines": []}
+    assert client.get("/tracenest/api/logs/my app.log/stream").text == ""
+    assert not router_module._TAIL_CACHE
+
+
+# ---------------------------------------------------------------------
+# Descriptor cache
+# ---------------------------------------------------------------------
+
+def test_recreated_file_gets_fresh_descriptor(log_dir):
+    path = log_dir / "app.log"
+    path.write_text("old\n")
+    assert router_module._read_log_tail("app.log", 1) == [b"old\n"]
+
+    # Rotation-style replace: same name, new inode
+    replacement = log_dir / "app.log.new"
+    replacement.write_text("new\n")
+    os.replace(replacement, path)
+
+    assert router_module._read_log_tail("app.log", 1) == [b"new\n"]
+
+    if router_module._FD_CACHE_ENABLED:
+        _, file_id, _ = router_module._FD_CACHE["app.log"]
+        st = os.stat(path)
+        assert file_id == (st.st_dev, st.st_ino)
+
+
+def test_deleted_file_descriptor_is_released(log_dir):
+    path = log_dir / "app.log"
+    path.write_text("gone\n")
+    router_module._read_log_tail("app.log", 1)
+
+    path.unlink()
+
+    assert router_module._read_log_tail("app.log", 1) == []
+    assert "app.log" not in router_module._FD_CACHE
+
+
+def test_idle_descriptor_is_closed_without_further_requests(log_dir, monkeypatch):
+    if not router_module._FD_CACHE_ENABLED:
+        pytest.skip("descriptor cache is POSIX only")
+
+    monkeypatch.setattr(router_module, "_FD_CACHE_MAX_IDLE_NS", 50_000_000)
+    (log_dir / "app.log").write_text("idle\n")
+
+    router_module._read_log_tail("app.log", 1)
+    assert "app.log" in router_module._FD_CACHE
+
+    deadline = time.monotonic() + 2.0
+    while router_module._FD_CACHE and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert "app.log" not in router_module._FD_CACHE
+
+
+# ---------------------------------------------------------------------
+# Coalescing and response cache
+# ---------------------------------------------------------------------
+
+def test_concurrent_identical_reads_are_coalesced(log_dir, monkeypatch):
+    (log_dir / "app.log").write_text("a\nb\n")
+
+    calls = []
+    real_read = router_module._read_log_file
+
+    def counting_read(filename, limit):
+        calls.append((filename, limit))
+        return real_read(filename, limit)
+
+    monkeypatch.setattr(router_module, "_read_log_file", counting_read)
+
+    app = FastAPI()
+    app.include_router(router_module.router)
+
+    async def fetch_many():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            url = "/tracenest/api/logs/app.log?limit=1"
+            return await asyncio.gather(*[c.get(url) for _ in range(10)])
+
+    responses = asyncio.run(fetch_many())
+
+    assert {r.json()["lines"][0] for r in responses} == {"b\n"}
+    assert calls == [("app.log", 1)]
+
+
+def test_bundled_ui_limit_is_cached(log_dir, monkeypatch):
+    monkeypatch.setattr(router_module, "_TAIL_CACHE_TTL_NS", 60 * 1_000_000_000)
+    (log_dir / "app.log").write_text("a\nb\n")
+
+    calls = []
+    real_read = router_module._read_log_file
+
+    def counting_read(filename, limit):
+        calls.append(limit)
+        return real_read(filename, limit)
+
+    monkeypatch.setattr(router_module, "_read_log_file", counting_read)
+
+    # The limit app.js polls with
+    client = _build_client()
+    for _ in range(3):
+        res = client.get("/tracenest/api/logs/app.log?limit=5000")
+        assert res.json()["lines"] == ["a\n", "b\n"]
+
+    assert calls == [5000]
+    assert ("app.log", 5000) in router_module._TAIL_CACHE
+
+
+def test_tail_cache_respects_byte_budget(log_dir, monkeypatch):
+    monkeypatch.setattr(router_module, "_TAIL_CACHE_MAX_BYTES", 1_000)
+    (log_dir / "app.log").write_text("x" * 99 + "\n" * 50)
+
+    client = _build_client()
+    for limit in range(1, 40):
+        client.get(f"/tracenest/api/logs/app.log?limit={limit}")
+
+    held = sum(len(body) for _, body in router_module._TAIL_CACHE.values())
+    assert router_module._TAIL_CACHE_BYTES == held
+    assert 0 < held <= 1_000
+
+
+def test_expired_tail_is_reread(log_dir, monkeypatch):
+    monkeypatch.setattr(router_module, "_TAIL_CACHE_TTL_NS", 0)
+    path = log_dir / "app.log"
+    path.write_text("one\n")
+
+    client = _build_client()
+    url = "/tracenest/api/logs/app.log?limit=1"
+    assert client.get(url).json()["lines"] == ["one\n"]
+
+    path.write_text("two\n")
+    assert client.get(url).json()["lines"] == ["two\n"]
+
+
+# ---------------------------------------------------------------------
+# UI shell and assets
+# ---------------------------------------------------------------------
+
+def test_index_revalidates_with_etag(log_dir):
+    client = _build_client()
+
+    first = client.get("/tracenest/")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get("/tracenest/", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+
+def test_assets_are_served_with_validators(log_dir):
+    client = _build_client()
+
+    res = client.get("/tracenest/assets/app.js")
+    assert res.status_code == 200
+    assert res.headers["cache-control"] == "no-cache"
+
+    again = client.get(
+        "/tracenest/assets/app.js",
+        headers={"If-None-Match": res.headers["etag"]},
+    )
+    assert again.status_code == 304
+
+
+@pytest.mark.parametrize("path", ["../router.py", "../../tracenest/__init__.py"])
+def test_asset_traversal_is_refused(path):
+    from starlette.exceptions import HTTPException
+    from starlette.requests import Request
+
+    # Called directly: an HTTP client would normalize ".." away first
+    request = Request({"type": "http", "method": "GET", "headers": []})
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(router_module._serve_template(path, request))
+
+    assert exc_info.value.status_code == 404
@@ -85,13 +85,20 @@ RETENTION_RUN_ON_STARTUP: Final[bool] = True
 # Whether retention cleanup runs during runtime
 RETENTION_RUN_ON_WRITE: Final[bool] = False
 
+# Minimum interval between retention scans of the same log root
+# (nanoseconds, monotonic clock). Default: once per minute
+RETENTION_COOLDOWN_NS: Final[int] = 60 * 1_000_000_000
+
 # =====================================================================
 # Write & Buffering Behavior
 # =====================================================================
 
-# Number of log entries buffered before flushing to disk
+# Maximum number of log entries written to disk per batch
 WRITE_BUFFER_SIZE: Final[int] = 50
 
+# Maximum number of batches submitted in a single write call
+WRITE_MAX_BATCHES_PER_WRITE: Final[int] = 16
+
 # Flush logs automatically on interpreter exit
 FLUSH_ON_EXIT: Final[bool] = True
 
@@ -174,11 +181,16 @@ FASTAPI_MIDDLEWARE_ENABLED: Final[bool] = True
 # Log request body size limit (bytes)
 FASTAPI_MAX_BODY_LOG_SIZE: Final[int] = 4 * 1024  # 4 KB
 
-# Paths excluded from FastAPI logging
-FASTAPI_EXCLUDED_PATHS: Final[set[str]] = {
+# Paths excluded from FastAPI logging (exact match)
+FASTAPI_EXCLUDED_PATHS: Final[frozenset[str]] = frozenset({
     "/tracenest",
     "/health",
-}
+})
+
+# Path prefixes excluded from FastAPI logging (UI pages & API)
+FASTAPI_EXCLUDED_PREFIXES: Final[tuple[str, ...]] = (
+    "/tracenest/",
+)
 
 # =====================================================================
 # UI Defaults
@@ -209,3 +221,6 @@ MAX_LOG_RECORD_SIZE_BYTES = 50 * 1024  # 50 KB
 # Maximum exception stack trace length
 MAX_EXCEPTION_STACK_LENGTH = 20 * 1024  # 20 KB
 
+# Maximum number of frames formatted per exception (innermost kept)
+MAX_EXCEPTION_STACK_FRAMES = 20
+
@@ -13,23 +13,42 @@ SAFETY GUARANTEES:
 from __future__ import annotations
 
 import json
-import inspect
+import math
 import os
+import sys
 import threading
+import time
 import traceback
-from datetime import datetime, timezone
+from datetime import datetime
+from enum import Enum
+from itertools import islice
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is the fallback
+    orjson = None
+
+# Keys as str; datetimes and dataclasses left to the `default` hook,
+# which stdlib json also uses for them (see _dumps)
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
 from .config import (
     PROJECT_NAME,
     PROJECT_VERSION,
-    TIMESTAMP_FORMAT,
     USE_UTC_TIMESTAMPS,
     MAX_MESSAGE_LENGTH,
     MAX_METADATA_SIZE,
     MAX_METADATA_KEYS,
     MAX_METADATA_KEY_LENGTH,
     MAX_EXCEPTION_STACK_LENGTH,
+    MAX_EXCEPTION_STACK_FRAMES,
     MAX_LOG_RECORD_SIZE_BYTES,
     FAIL_SILENTLY,
 )
@@ -39,11 +58,38 @@ from .config import (
 # =====================================================================
 
 
+# (epoch_second, "YYYY-MM-DDTHH:MM:SS.") of the last UTC second seen.
+# Rebound as a single tuple so readers never see a torn pair.
+_TS_CACHE: tuple[int, str] = (-1, "")
+
+
 def _utc_now_iso() -> str:
+    """
+    Timestamp formatted as TIMESTAMP_FORMAT (%Y-%m-%dT%H:%M:%S.%fZ).
+
+    The date/time prefix is built from time.gmtime() at most once per
+    second; each call only appends its own microseconds.
+    """
+    global _TS_CACHE
+
     try:
-        if USE_UTC_TIMESTAMPS:
-            return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
-        return datetime.now().isoformat()
+        if not USE_UTC_TIMESTAMPS:
+            return datetime.now().isoformat()
+
+        sec, ns = divmod(time.time_ns(), 1_000_000_000)
+
+        cached = _TS_CACHE
+        if cached[0] == sec:
+            prefix = cached[1]
+        else:
+            t = time.gmtime(sec)
+            prefix = (
+                f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+                f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}."
+            )
+            _TS_CACHE = (sec, prefix)
+
+        return f"{prefix}{ns // 1000:06d}Z"
     except Exception:
         return ""
 
@@ -53,27 +99,111 @@ def _utc_now_iso() -> str:
 # =====================================================================
 
 
-def _truncate(value: str, limit: int) -> str:
+def _value_size(value: Any) -> int:
+    """
+    Approximate serialized size of a metadata value.
+    """
     try:
-        if value is None:
-            return ""
-        return value if len(value) <= limit else value[:limit]
+        return len(str(value))
     except Exception:
-        return ""
+        return 0
+
 
+def _coerce_unserializable(value: Any) -> Any:
+    """
+    Encoder `default` hook: called once, only for values the encoder
+    cannot serialize natively. Enums become their value (as orjson
+    writes them natively); everything else becomes str(value).
+    """
+    try:
+        if isinstance(value, Enum):
+            return value.value
+        return str(value)
+    except Exception:
+        return "<unserializable>"
 
-def _safe_json_value(value: Any) -> Any:
+
+def _dumps(record: Dict[str, Any]) -> bytes:
     """
-    Guarantees JSON-serializable output.
+    Serializes a record to a single UTF-8 encoded JSON line.
+
+    Unserializable values are coerced by the encoder itself
+    (see _coerce_unserializable), so values are never probed ahead
+    of time. orjson is used when installed and already emits bytes;
+    stdlib json is the fallback (and also covers values orjson
+    rejects, e.g. >64-bit ints or lone surrogates).
+
+    Both encoders are configured to agree, so a value is written the
+    same way whichever one handles the record:
+    - compact separators, insertion order (no key sort)
+    - datetime / date / time and dataclasses go through the `default`
+      hook (orjson would otherwise write them natively)
+    - non-finite floats are written as null, as orjson does; stdlib
+      rejects them (allow_nan=False) and the value pass below
+      substitutes null
+
+    Some failures never reach the `default` hook (nested non-str
+    keys, cyclic containers, NaN under stdlib). Only then are
+    metadata values encoded one by one, and just the failing ones
+    are replaced, so one bad value never costs the whole line.
     """
     try:
-        json.dumps(value)
-        return value
+        return _encode(record)
     except Exception:
+        meta = record.get("meta")
+        if not meta:
+            raise
+
+    return _encode({**record, "meta": _coerce_failing_values(meta)})
+
+
+def _encode(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                value,
+                default=_coerce_unserializable,
+                option=_ORJSON_OPTIONS,
+            )
+        except Exception:
+            pass
+
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+        default=_coerce_unserializable,
+    ).encode("utf-8", "replace")
+
+
+def _coerce_failing_values(meta: Dict[str, Any]) -> Dict[str, Any]:
+    safe: Dict[str, Any] = {}
+    for k, v in meta.items():
+        # NaN must go even where orjson accepts it: the final encode
+        # may still fall back to stdlib (e.g. for a >64-bit int)
         try:
-            return str(value)
+            v = _null_non_finite(v)
+            _encode(v)
         except Exception:
-            return "<unserializable>"
+            v = _coerce_unserializable(v)
+        safe[k] = v
+    return safe
+
+
+def _null_non_finite(value: Any) -> Any:
+    """
+    Copy of `value` with NaN / Infinity replaced by None, through
+    plain lists, tuples and dicts (what orjson writes as null).
+    """
+    tv = type(value)
+    if tv is float:
+        return value if math.isfinite(value) else None
+    if tv is list or tv is tuple:
+        return [_null_non_finite(v) for v in value]
+    if tv is dict:
+        return {k: _null_non_finite(v) for k, v in value.items()}
+    return value
 
 
 # =====================================================================
@@ -81,6 +211,45 @@ def _safe_json_value(value: Any) -> Any:
 # =====================================================================
 
 
+# Exact scalar types accepted by the fast path, besides str.
+# Subclasses are excluded on purpose (type() match, not isinstance).
+_FAST_SCALAR_TYPES = frozenset({int, float, bool, type(None)})
+
+# Upper bound of len(str(v)) for the scalars the fast path accepts
+_FAST_SCALAR_SIZE = 24
+_FAST_INT_LIMIT = 10**15
+
+
+def _fast_sanitize(metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Fast path for the common case: str keys and primitive values,
+    everything within limits. The dict is returned as-is (never
+    mutated downstream).
+
+    Sizes use an upper bound, so whatever is accepted here would be
+    kept whole by the full pass. Returns None when unsure.
+    """
+    if len(metadata) > MAX_METADATA_KEYS:
+        return None
+
+    size = 0
+    for k, v in metadata.items():
+        if type(k) is not str or len(k) > MAX_METADATA_KEY_LENGTH:
+            return None
+
+        tv = type(v)
+        if tv is str:
+            size += len(k) + len(v)
+        elif tv in _FAST_SCALAR_TYPES:
+            if tv is int and not -_FAST_INT_LIMIT < v < _FAST_INT_LIMIT:
+                return None
+            size += len(k) + _FAST_SCALAR_SIZE
+        else:
+            return None
+
+    return metadata if size <= MAX_METADATA_SIZE else None
+
+
 def _sanitize_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Enforces:
@@ -88,29 +257,30 @@ def _sanitize_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     - flat structure
     - key count limit
     - total size limit
-    - JSON safety
+
+    JSON safety is enforced at encode time (see _dumps).
     """
     if not metadata or not isinstance(metadata, dict):
         return {}
 
-    safe: Dict[str, Any] = {}
-    total_size = 0
-    key_count = 0
+    fast = _fast_sanitize(metadata)
+    if fast is not None:
+        return fast
 
-    for k, v in metadata.items():
-        if key_count >= MAX_METADATA_KEYS:
-            break
+    safe: Dict[str, Any] = {}
+    budget = MAX_METADATA_SIZE
 
-        key = str(k)[:MAX_METADATA_KEY_LENGTH]
-        val = _safe_json_value(v)
+    # islice bounds the key count without a per-key counter
+    for k, v in islice(metadata.items(), MAX_METADATA_KEYS):
+        key = k if type(k) is str else str(k)
+        if len(key) > MAX_METADATA_KEY_LENGTH:
+            key = key[:MAX_METADATA_KEY_LENGTH]
 
-        entry_size = len(key) + len(str(val))
-        if total_size + entry_size > MAX_METADATA_SIZE:
+        budget -= len(key) + (len(v) if type(v) is str else _value_size(v))
+        if budget < 0:
             break
 
-        safe[key] = val
-        total_size += entry_size
-        key_count += 1
+        safe[key] = v
 
     return safe
 
@@ -120,41 +290,77 @@ def _sanitize_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
 # =====================================================================
 
 
-def _get_source() -> Dict[str, Any]:
+# Frames between _get_source and the caller of each entry point:
+#   logger: _get_source <- _format_log_bytes <- _log <- Logger.log <- caller
+#   direct: _get_source <- _format_log_bytes <- format_log <- caller
+_LOGGER_SOURCE_DEPTH = 4
+_FORMAT_LOG_SOURCE_DEPTH = 3
+
+
+def _get_source(depth: int) -> Dict[str, Any]:
     """
-    Best-effort capture of caller location.
+    Best-effort capture of caller location, `depth` frames up.
+
+    Reads a single frame; never builds the full stack or reads source.
     """
     try:
-        frame = inspect.stack()[4]
+        frame = sys._getframe(depth)
+        code = frame.f_code
         return {
-            "file": frame.filename,
-            "line": frame.lineno,
-            "function": frame.function,
+            "file": code.co_filename,
+            "line": frame.f_lineno,
+            "function": code.co_name,
         }
-    except Exception:
+    except (ValueError, AttributeError):
         return {}
 
 
+# PID of the current process, refreshed in fork children
+_PID = os.getpid()
+
+
+def _on_fork_child() -> None:
+    global _PID
+    _PID = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_on_fork_child)
+
+
 def _get_runtime_context() -> Dict[str, Any]:
     """
     Minimal runtime context for debugging concurrency & crashes.
+
+    The pid is cached per process; only the thread name is read
+    per call.
     """
     try:
         return {
-            "pid": os.getpid(),
+            "pid": _PID,
             "thread": threading.current_thread().name,
         }
     except Exception:
         return {}
 
 
+# Resolved on first use; the environment is fixed per process
+_ENV: Optional[str] = None
+
+
 def _get_env() -> str:
     """
     Explicit environment signal.
     Zero config. Best effort.
     """
+    global _ENV
+
+    env = _ENV
+    if env is not None:
+        return env
+
     try:
-        return (
+        env = (
             os.getenv("TRACENEST_ENV")
             or os.getenv("ENV")
             or os.getenv("APP_ENV")
@@ -163,31 +369,79 @@ def _get_env() -> str:
     except Exception:
         return "local"
 
+    _ENV = env
+    return env
+
 
 # =====================================================================
 # Exception handling
 # =====================================================================
 
 
+def _exceeds_frame_limit(exc: Optional[BaseException]) -> bool:
+    """
+    True if any traceback in the printed chain is deeper than
+    MAX_EXCEPTION_STACK_FRAMES (its outer frames were left out).
+    """
+    seen: set[int] = set()
+
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+
+        depth = 0
+        tb = exc.__traceback__
+        while tb is not None:
+            depth += 1
+            if depth > MAX_EXCEPTION_STACK_FRAMES:
+                return True
+            tb = tb.tb_next
+
+        # The chain traceback prints: explicit cause, else context
+        exc = exc.__cause__ or (
+            None if exc.__suppress_context__ else exc.__context__
+        )
+
+    return False
+
+
 def _format_exception(exc: BaseException) -> Dict[str, Any]:
     """
     Formats exception safely with bounded stack trace.
     """
     try:
-        stack = "".join(
-            traceback.format_exception(type(exc), exc, exc.__traceback__)
+        # Negative limit keeps the innermost frames (where it failed);
+        # source lines are only looked up for the frames kept.
+        te = traceback.TracebackException(
+            type(exc),
+            exc,
+            exc.__traceback__,
+            limit=-MAX_EXCEPTION_STACK_FRAMES,
+            capture_locals=False,
         )
 
+        parts: list[str] = []
+        total = 0
         truncated = False
-        if len(stack) > MAX_EXCEPTION_STACK_LENGTH:
-            stack = stack[:MAX_EXCEPTION_STACK_LENGTH]
-            truncated = True
+
+        # Format lazily; stop as soon as the size budget is spent
+        chunks = te.format()
+        for chunk in chunks:
+            parts.append(chunk)
+            total += len(chunk)
+            if total >= MAX_EXCEPTION_STACK_LENGTH:
+                truncated = (
+                    total > MAX_EXCEPTION_STACK_LENGTH
+                    or next(chunks, None) is not None
+                )
+                break
+
+        stack = "".join(parts)[:MAX_EXCEPTION_STACK_LENGTH]
 
         return {
             "type": exc.__class__.__name__,
             "message": str(exc),
             "stack": stack,
-            "truncated": truncated,
+            "truncated": truncated or _exceeds_frame_limit(exc),
         }
     except Exception:
         return {}
@@ -197,6 +451,80 @@ def _format_exception(exc: BaseException) -> Dict[str, Any]:
 # Public formatter (FINAL BOUNDARY)
 # =====================================================================
 
+# Fields identical on every record
+_RECORD_SKELETON: Dict[str, Any] = {
+    "schema": "tracenest.v1",
+    "project": PROJECT_NAME,
+    "version": PROJECT_VERSION,
+}
+
+# The skeleton serialized once, as an open object ('{...,'); each
+# record only serializes its dynamic fields and is appended to it.
+_RECORD_PREFIX: bytes = _dumps(_RECORD_SKELETON)[:-1] + b","
+
+
+# Re-encodes spent on one field before moving to the next
+_FIT_PASSES_PER_FIELD = 3
+
+
+def _encode_record(record: Dict[str, Any]) -> bytes:
+    # record always holds "ts", so its b"{" is replaced by the prefix
+    return _RECORD_PREFIX + _dumps(record)[1:]
+
+
+def _fit_record(record: Dict[str, Any], serialized: bytes) -> bytes:
+    """
+    Shrinks an over-budget record to MAX_LOG_RECORD_SIZE_BYTES.
+
+    Encoded bytes are never sliced: a cut could split a multi-byte
+    character and leave invalid JSON. The largest text fields are
+    shortened instead (stack, exception message, msg) and the record
+    re-encoded. Each cut is sized from the field's own encoded bytes
+    per character, so multi-byte or escaped text is not over-trimmed. Metadata is
+    dropped next, and a minimal placeholder record is the last resort.
+    """
+    fields = []
+    exc = record.get("exc")
+    if exc:
+        fields += [(exc, "stack"), (exc, "message")]
+    fields.append((record, "msg"))
+
+    for container, key in fields:
+        value = container.get(key)
+        if type(value) is not str:
+            continue
+
+        # A few passes at most: JSON escaping can outgrow the estimate
+        for _ in range(_FIT_PASSES_PER_FIELD):
+            if not value:
+                break
+
+            excess = len(serialized) - MAX_LOG_RECORD_SIZE_BYTES
+            # Encoded bytes per character, quotes excluded
+            ratio = max(1.0, (len(_encode(value)) - 2) / len(value))
+            value = value[:max(0, len(value) - math.ceil(excess / ratio))]
+
+            container[key] = value
+            if container is exc:
+                exc["truncated"] = True
+
+            serialized = _encode_record(record)
+            if len(serialized) <= MAX_LOG_RECORD_SIZE_BYTES:
+                return serialized
+
+    if record.get("meta"):
+        record["meta"] = {}
+        serialized = _encode_record(record)
+        if len(serialized) <= MAX_LOG_RECORD_SIZE_BYTES:
+            return serialized
+
+    return _encode_record({
+        "ts": record.get("ts", ""),
+        "level": record.get("level", ""),
+        "msg": "<log record too large>",
+        "env": record.get("env", ""),
+    })
+
 
 def format_log(
     *,
@@ -214,37 +542,70 @@ def format_log(
     It must never raise.
     """
     try:
-        ts = _utc_now_iso()
-        msg = _truncate(str(message), MAX_MESSAGE_LENGTH)
+        line = _format_log_bytes(
+            level=level,
+            message=message,
+            metadata=metadata,
+            include_source=include_source,
+            exception=exception,
+            trace_id=trace_id,
+            source_depth=_FORMAT_LOG_SOURCE_DEPTH,
+        )
+        return line[:-1].decode("utf-8", "replace")
+    except Exception:
+        if FAIL_SILENTLY:
+            return ""
+        raise
 
-        record: Dict[str, Any] = {
-            # ---- schema identity ----
-            "schema": "tracenest.v1",
-            "project": PROJECT_NAME,
-            "version": PROJECT_VERSION,
 
-            # ---- canonical fields ----
-            "ts": ts,                 # internal
-            "timestamp": ts,          # external-friendly
-            "level": str(level).upper(),
+def _format_log_bytes(
+    *,
+    level: str,
+    message: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    include_source: bool = False,
+    exception: Optional[BaseException] = None,
+    trace_id: Optional[str] = None,
+    source_depth: int = _LOGGER_SOURCE_DEPTH,
+) -> bytes:
+    """
+    Same as format_log, but returns the encoded line, terminated
+    with b"\\n" (b"" on failure). `source_depth` locates the caller
+    for include_source (see _LOGGER_SOURCE_DEPTH).
+
+    Used by the logger so the line reaches the writer as bytes
+    and is never decoded, re-encoded or re-joined on the way to disk.
+    """
+    try:
+        # ---- schema identity: pre-serialized, see _RECORD_PREFIX ----
+        record: Dict[str, Any] = {}
+
+        # ---- canonical fields ----
+        # One name per concept: the former "timestamp" / "message"
+        # aliases duplicated ts / msg on every line and were dropped.
+        record["ts"] = _utc_now_iso()
+        record["level"] = (
+            level.upper() if type(level) is str else str(level).upper()
+        )
 
-            "msg": msg,               # internal
-            "message": msg,           # external-friendly
+        msg = message if type(message) is str else str(message)
+        if len(msg) > MAX_MESSAGE_LENGTH:
+            msg = msg[:MAX_MESSAGE_LENGTH]
+        record["msg"] = msg
 
-            "env": _get_env(),
+        record["env"] = _get_env()
 
-            # ---- structured metadata ----
-            "meta": _sanitize_metadata(metadata),
+        # ---- structured metadata ----
+        record["meta"] = _sanitize_metadata(metadata) if metadata else {}
 
-            # ---- runtime context ----
-            "ctx": _get_runtime_context(),
-        }
+        # ---- runtime context ----
+        record["ctx"] = _get_runtime_context()
 
         if trace_id:
             record["trace_id"] = str(trace_id)
 
         if include_source:
-            src = _get_source()
+            src = _get_source(source_depth)
             if src:
                 record["src"] = src
 
@@ -253,19 +614,15 @@ def format_log(
             if exc:
                 record["exc"] = exc
 
-        serialized = json.dumps(
-            record,
-            ensure_ascii=False,
-            sort_keys=True,
-        )
+        serialized = _encode_record(record)
 
         # Final absolute size guard
         if len(serialized) > MAX_LOG_RECORD_SIZE_BYTES:
-            serialized = serialized[:MAX_LOG_RECORD_SIZE_BYTES]
+            serialized = _fit_record(record, serialized)
 
-        return serialized
+        return serialized + b"\n"
 
     except Exception:
         if FAIL_SILENTLY:
-            return ""
+            return b""
         raise
@@ -14,24 +14,39 @@ SAFETY GUARANTEES:
 
 from __future__ import annotations
 
+import os
+import re
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from .config import (
     RETENTION_DAYS,
+    RETENTION_COOLDOWN_NS,
     ARCHIVE_DIR_NAME,
     LOG_FILE_EXTENSION,
     FAIL_SILENTLY,
-    LOG_FILE_DATE_FORMAT,
 )
+from ..utils.time import today_log_file_name
 
 # =====================================================================
 # Internal state (minimal & bounded)
 # =====================================================================
 
-_LAST_RETENTION_RUN: Optional[float] = None
-_RETENTION_COOLDOWN_SECONDS = 60.0  # run at most once per minute
+# Last scan per log root, in time.monotonic_ns() units.
+# Monotonic: immune to wall-clock jumps, and a cheap vDSO read.
+# At most _MAX_TRACKED_ROOTS roots; the least recently scanned goes.
+_LAST_SCAN_NS: OrderedDict[Path, int] = OrderedDict()
+_MAX_TRACKED_ROOTS = 64
+
+
+# Day-wise log names, LOG_FILE_DATE_FORMAT (%Y-%m-%d) + extension.
+# Precompiled: matched against every file in every retention pass.
+_LOG_NAME_RE = re.compile(
+    r"[0-9]{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12][0-9]|3[01])"
+    + re.escape(LOG_FILE_EXTENSION)
+)
 
 
 # =====================================================================
@@ -48,27 +63,30 @@ def enforce_retention(log_root: Path) -> None:
     - periodically
     - multiple times
     """
-    global _LAST_RETENTION_RUN
-
     try:
-        now = time.time()
+        now_ns = time.monotonic_ns()
 
         # Cooldown guard to prevent retention storms
-        if _LAST_RETENTION_RUN and (now - _LAST_RETENTION_RUN) < _RETENTION_COOLDOWN_SECONDS:
+        last_ns = _LAST_SCAN_NS.get(log_root)
+        if last_ns is not None and (now_ns - last_ns) < RETENTION_COOLDOWN_NS:
             return
-        _LAST_RETENTION_RUN = now
 
-        if not log_root.exists() or not log_root.is_dir():
+        if not log_root.is_dir():
             return
 
-        cutoff_ts = _retention_cutoff_timestamp(now)
+        _LAST_SCAN_NS[log_root] = now_ns
+        _LAST_SCAN_NS.move_to_end(log_root)
+        while len(_LAST_SCAN_NS) > _MAX_TRACKED_ROOTS:
+            _LAST_SCAN_NS.popitem(last=False)
+
+        cutoff_ts = _retention_cutoff_timestamp(time.time())
         if cutoff_ts is None:
             return
 
         # 1. Clean archive directory first
         archive_dir = log_root / ARCHIVE_DIR_NAME
-        if archive_dir.exists() and archive_dir.is_dir():
-            _clean_directory(archive_dir, cutoff_ts, allow_all_logs=True)
+        if archive_dir.is_dir():
+            _clean_directory(archive_dir, cutoff_ts, _is_archived_log)
 
         # 2. Clean old daily log files in root (excluding today)
         _clean_root_logs(log_root, cutoff_ts)
@@ -109,40 +127,44 @@ def _retention_cutoff_timestamp(now: float) -> Optional[float]:
 def _clean_directory(
     directory: Path,
     cutoff_ts: float,
-    *,
-    allow_all_logs: bool,
+    accept: Callable[[str], bool],
 ) -> None:
     """
-    Deletes files older than cutoff_ts in the given directory.
+    Deletes files older than cutoff_ts in the given directory whose
+    name passes `accept`.
+
+    One scandir pass; name checks run first (no syscall), then the
+    entry type from the scan, then a single stat for the mtime.
 
     Directories are never deleted.
     Symlinks are never followed.
     """
     try:
-        for item in directory.iterdir():
-            try:
-                if not item.is_file():
-                    continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if not accept(entry.name):
+                        continue
 
-                if item.is_symlink():
-                    continue
+                    # False for directories and symlinks alike
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
 
-                # Only delete TraceNest log files
-                if not allow_all_logs and not _looks_like_tracenest_log(item.name):
-                    continue
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                        os.unlink(entry.path)
 
-                stat = item.stat()
-                if stat.st_mtime < cutoff_ts:
-                    item.unlink(missing_ok=True)
-
-            except Exception:
-                continue
+                except Exception:
+                    continue
 
     except Exception:
         if not FAIL_SILENTLY:
             raise
 
 
+def _is_archived_log(filename: str) -> bool:
+    return filename.endswith(LOG_FILE_EXTENSION)
+
+
 def _clean_root_logs(log_root: Path, cutoff_ts: float) -> None:
     """
     Cleans old daily log files from the log root directory.
@@ -150,56 +172,17 @@ def _clean_root_logs(log_root: Path, cutoff_ts: float) -> None:
     IMPORTANT:
     - Never deletes today's active log file
     """
-    try:
-        today_name = _today_log_name()
-
-        for item in log_root.iterdir():
-            try:
-                if not item.is_file():
-                    continue
-
-                if item.is_symlink():
-                    continue
-
-                if item.name == today_name:
-                    continue
-
-                if not _looks_like_tracenest_log(item.name):
-                    continue
+    today_name = today_log_file_name()
 
-                stat = item.stat()
-                if stat.st_mtime < cutoff_ts:
-                    item.unlink(missing_ok=True)
+    def accept(name: str) -> bool:
+        # Only TraceNest day-wise logs, never today's
+        return name != today_name and _looks_like_tracenest_log(name)
 
-            except Exception:
-                continue
-
-    except Exception:
-        if not FAIL_SILENTLY:
-            raise
+    _clean_directory(log_root, cutoff_ts, accept)
 
 
 def _looks_like_tracenest_log(filename: str) -> bool:
     """
     Returns True if the filename matches TraceNest log naming.
     """
-    if not filename.endswith(LOG_FILE_EXTENSION):
-        return False
-
-    # Expected format: YYYY-MM-DD.log
-    try:
-        date_part = filename.replace(LOG_FILE_EXTENSION, "")
-        time.strptime(date_part, LOG_FILE_DATE_FORMAT)
-        return True
-    except Exception:
-        return False
-
-
-def _today_log_name() -> str:
-    """
-    Returns today's active log file name.
-    """
-    from datetime import datetime
-
-    today = datetime.utcnow().strftime(LOG_FILE_DATE_FORMAT)
-    return f"{today}{LOG_FILE_EXTENSION}"
+    return _LOG_NAME_RE.fullmatch(filename) is not None
@@ -14,6 +14,7 @@ from __future__ import annotations
 
 import os
 import time
+from collections import OrderedDict
 from pathlib import Path
 
 from .config import (
@@ -21,6 +22,7 @@ from .config import (
     LOG_FILE_EXTENSION,
     MAX_LOG_FILE_SIZE_BYTES,
     MAX_ROTATED_FILES_PER_DAY,
+    ROTATED_FILE_SEPARATOR,
     FAIL_SILENTLY,
 )
 
@@ -28,9 +30,11 @@ from .config import (
 # Internal state (minimal & bounded)
 # =====================================================================
 
-# Prevent rotation storms (best-effort, per-process)
-_LAST_ROTATION_ATTEMPT: dict[Path, float] = {}
+# Prevent rotation storms (best-effort, per-process).
+# LRU-bounded: one entry per file ever rotated would grow forever.
+_LAST_ROTATION_ATTEMPT: OrderedDict[Path, float] = OrderedDict()
 _ROTATION_COOLDOWN_SECONDS = 1.0  # small, safe cooldown
+_MAX_TRACKED_FILES = 64
 
 
 # =====================================================================
@@ -65,6 +69,9 @@ def rotate_if_needed(log_file: Path) -> None:
             return
 
         _LAST_ROTATION_ATTEMPT[log_file] = now
+        _LAST_ROTATION_ATTEMPT.move_to_end(log_file)
+        while len(_LAST_ROTATION_ATTEMPT) > _MAX_TRACKED_FILES:
+            _LAST_ROTATION_ATTEMPT.popitem(last=False)
 
         _rotate(log_file)
 
@@ -98,62 +105,104 @@ def _rotate(log_file: Path) -> None:
         archive_dir.mkdir(parents=True, exist_ok=True)
 
         base_name = log_file.stem  # YYYY-MM-DD
-        index = _next_rotation_index(archive_dir, base_name)
 
-        if index is None:
-            # Rotation limit reached; do nothing
-            return
+        # Another process may claim the same index; re-pick a bounded
+        # number of times instead of ever overwriting an archive.
+        for _ in range(MAX_ROTATED_FILES_PER_DAY):
+            index = _next_rotation_index(archive_dir, base_name)
 
-        rotated_name = f"{base_name}_{index}{LOG_FILE_EXTENSION}"
-        rotated_path = archive_dir / rotated_name
+            if index is None:
+                # Rotation limit reached; do nothing
+                return
 
-        # Never overwrite an existing archive
-        if rotated_path.exists():
-            return
+            rotated_name = (
+                f"{base_name}{ROTATED_FILE_SEPARATOR}{index}{LOG_FILE_EXTENSION}"
+            )
 
-        # Final existence check before replace
-        if not log_file.exists():
-            return
-
-        # Atomic rename (best-effort)
-        os.replace(log_file, rotated_path)
+            if _move_to_archive(log_file, archive_dir / rotated_name):
+                return
 
     except Exception:
         if not FAIL_SILENTLY:
             raise
 
 
-def _next_rotation_index(archive_dir: Path, base_name: str) -> int | None:
+def _move_to_archive(log_file: Path, rotated_path: Path) -> bool:
     """
-    Finds the next available rotation index for a given day.
+    Moves log_file to rotated_path without overwriting.
 
-    Returns None if rotation limit is reached.
+    link + unlink: creating the link fails if the archive already
+    exists, so the existence check and the move are one atomic step.
+    Falls back to os.replace where hard links are unsupported.
+
+    Returns False only when rotated_path is taken (caller re-picks).
     """
     try:
-        used = set()
+        os.link(log_file, rotated_path)
+    except FileExistsError:
+        return False
+    except FileNotFoundError:
+        # Log file already rotated away
+        return True
+    except OSError:
+        if rotated_path.exists():
+            return False
+        if log_file.exists():
+            os.replace(log_file, rotated_path)
+        return True
 
-        for file in archive_dir.iterdir():
-            if not file.is_file():
-                continue
+    try:
+        os.unlink(log_file)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        # Keep a single copy: undo the link rather than duplicate logs
+        try:
+            os.unlink(rotated_path)
+        except OSError:
+            pass
 
-            name = file.name
-            if not name.startswith(f"{base_name}_"):
-                continue
+    return True
 
-            try:
-                suffix = (
-                    name.replace(base_name + "_", "")
-                        .replace(LOG_FILE_EXTENSION, "")
-                )
-                used.add(int(suffix))
-            except Exception:
-                continue
 
-        for i in range(1, MAX_ROTATED_FILES_PER_DAY + 1):
-            if i not in used:
-                return i
+def _next_rotation_index(archive_dir: Path, base_name: str) -> int | None:
+    """
+    Finds the next rotation index for a given day: one past the
+    highest index already archived, so archives stay chronological.
+
+    Single directory scan over names only.
 
-        return None
+    Returns None if rotation limit is reached.
+    """
+    try:
+        prefix = f"{base_name}{ROTATED_FILE_SEPARATOR}"
+        start = len(prefix)
+        end = -len(LOG_FILE_EXTENSION)
+        highest = 0
+
+        with os.scandir(archive_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (
+                    name.startswith(prefix)
+                    and name.endswith(LOG_FILE_EXTENSION)
+                ):
+                    continue
+
+                try:
+                    index = int(name[start:end])
+                except ValueError:
+                    continue
+
+                # Any entry holds its name, whatever its type, so the
+                # match needs no file-type check (and never a stat).
+                if index > highest:
+                    highest = index
+
+        if highest >= MAX_ROTATED_FILES_PER_DAY:
+            return None
+
+        return highest + 1
 
     except Exception:
         return None
@@ -14,16 +14,18 @@ SAFETY GUARANTEES:
 from __future__ import annotations
 
 import os
+import queue
 import threading
+import weakref
 from pathlib import Path
 from typing import Optional
 
 from .config import (
-    LOG_FILE_DATE_FORMAT,
-    LOG_FILE_EXTENSION,
     MAX_LOG_FILE_SIZE_BYTES,
     MAX_LOG_RECORD_SIZE_BYTES,
     WRITE_BUFFER_SIZE,
+    WRITE_MAX_BATCHES_PER_WRITE,
+    WRITE_LOCK_TIMEOUT_SECONDS,
     FLUSH_ON_EXIT,
     FAIL_SILENTLY,
     ENABLE_ROTATION,
@@ -31,6 +33,87 @@ from .config import (
 from .config import get_log_root_path
 from .rotation import rotate_if_needed
 from .retention import enforce_retention
+from ..utils.time import today_log_file_name
+
+# =====================================================================
+# Queue sentinels
+# =====================================================================
+
+# Tells the drain thread to write what it has and exit
+_STOP = object()
+
+# Lines submitted by a single drain pass
+_MAX_LINES_PER_WRITE = WRITE_BUFFER_SIZE * WRITE_MAX_BATCHES_PER_WRITE
+
+# Vectored writes submit a batch's lines in one syscall (POSIX only)
+_HAS_WRITEV = hasattr(os, "writev")
+
+# Most buffers a single writev() accepts
+try:
+    _IOV_MAX = max(16, os.sysconf("SC_IOV_MAX"))
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+
+# =====================================================================
+# Fork handling
+# =====================================================================
+
+
+def _register_fork_handler(writer: LogWriter) -> None:
+    """
+    Re-initializes `writer` in fork children, so the write path needs
+    no per-line fork check. Holds only a weak reference: at-fork
+    handlers cannot be unregistered.
+    """
+    if not hasattr(os, "register_at_fork"):
+        return
+
+    ref = weakref.ref(writer)
+
+    def _after_fork_in_child() -> None:
+        w = ref()
+        if w is not None:
+            try:
+                w._reinitialize_after_fork()
+            except Exception:
+                pass
+
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# =====================================================================
+# Low-level I/O
+# =====================================================================
+
+
+def _write_all(fd: int, buffers: list[bytes]) -> None:
+    """
+    Appends all buffers to fd, in order.
+
+    With writev() the buffers are submitted as-is, never joined into
+    one copy; short writes are completed with plain write() calls.
+    """
+    if not _HAS_WRITEV:
+        _write_fully(fd, b"".join(buffers))
+        return
+
+    for start in range(0, len(buffers), _IOV_MAX):
+        chunk = buffers[start:start + _IOV_MAX]
+        written = os.writev(fd, chunk)
+
+        if written < sum(map(len, chunk)):
+            _write_fully(fd, b"".join(chunk)[written:])
+
+
+def _write_fully(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        if written <= 0:
+            break
+        view = view[written:]
+
 
 # =====================================================================
 # Writer
@@ -40,16 +123,25 @@ from .retention import enforce_retention
 class LogWriter:
     """
     Buffered, thread-safe, best-effort log writer.
+
+    Producers only enqueue lines. A single background thread drains
+    the queue and writes batches of up to WRITE_BUFFER_SIZE lines,
+    so file I/O never happens on the caller's thread.
     """
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._buffer: list[str] = []
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
         self._current_file: Optional[Path] = None
-        self._pid = os.getpid()
+        self._fd: Optional[int] = None
+        self._fd_path: Optional[Path] = None
+        self._fd_id: Optional[tuple[int, int]] = None
+        self._fd_size = 0
         self._shutting_down = False
 
         self._initialize()
+        _register_fork_handler(self)
 
         if FLUSH_ON_EXIT:
             try:
@@ -76,53 +168,102 @@ class LogWriter:
             if not FAIL_SILENTLY:
                 raise
 
+        self._start_drain_thread()
+
+    def _start_drain_thread(self) -> None:
+        try:
+            self._thread = threading.Thread(
+                target=self._drain,
+                args=(self._queue,),
+                name="tracenest-writer",
+                daemon=True,
+            )
+            self._thread.start()
+        except Exception:
+            # e.g. interpreter shutdown; flush() drains inline instead
+            self._thread = None
+
+    def _reinitialize_after_fork(self) -> None:
+        # Locks and threads do not survive fork(); never acquire the
+        # inherited lock, it may be held by the parent's drain thread.
+        self._lock = threading.Lock()
+        self._close_fd()
+
+        # Lines queued by the parent belong to the parent
+        stale = self._queue
+        self._queue = queue.SimpleQueue()
+        stale.put_nowait(_STOP)
+
+        self._initialize()
+
     def _shutdown_flush(self) -> None:
+        if self._shutting_down:
+            return
+
         self._shutting_down = True
         try:
-            self.flush()
+            self._queue.put_nowait(_STOP)
+
+            thread = self._thread
+            if thread is not None and thread.is_alive():
+                thread.join(WRITE_LOCK_TIMEOUT_SECONDS)
+            else:
+                self._drain_inline()
         except Exception:
             pass
+        finally:
+            self._close_fd_if_idle()
+
+    def _close_fd_if_idle(self) -> None:
+        """
+        Closes the descriptor unless a write may still be using it.
+
+        A drain thread that outlived the join may be mid-writev; closing
+        under it could redirect its bytes into whatever file reuses the
+        descriptor number, so the descriptor is left to process exit.
+        """
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            return
+
+        if self._lock.acquire(timeout=WRITE_LOCK_TIMEOUT_SECONDS):
+            try:
+                self._close_fd()
+            finally:
+                self._lock.release()
 
     # -----------------------------------------------------------------
     # File resolution
     # -----------------------------------------------------------------
 
     def _resolve_log_file(self) -> Path:
-        from datetime import datetime
-
-        date_str = datetime.utcnow().strftime(LOG_FILE_DATE_FORMAT)
-        filename = f"{date_str}{LOG_FILE_EXTENSION}"
-
-        return get_log_root_path() / filename
+        return get_log_root_path() / today_log_file_name()
 
     # -----------------------------------------------------------------
     # Public API
     # -----------------------------------------------------------------
 
-    def write(self, log_line: str) -> None:
+    def write(self, log_line: bytes | str) -> None:
         """
-        Accepts a single formatted log line.
+        Accepts a single formatted log line, preferably pre-encoded
+        UTF-8 bytes ending in b"\\n" (str is encoded and unterminated
+        lines are terminated here).
         """
         if not log_line or self._shutting_down:
             return
 
-        # Drop oversized individual log lines
-        if len(log_line) > MAX_LOG_RECORD_SIZE_BYTES:
-            return
-
         try:
-            # Fork detection (best effort)
-            if os.getpid() != self._pid:
-                with self._lock:
-                    self._pid = os.getpid()
-                    self._buffer.clear()
-                    self._initialize()
+            if type(log_line) is not bytes:
+                log_line = str(log_line).encode("utf-8", "replace")
+
+            if not log_line.endswith(b"\n"):
+                log_line += b"\n"
 
-            with self._lock:
-                self._buffer.append(log_line)
+            # Drop oversized individual log lines (newline excluded)
+            if len(log_line) > MAX_LOG_RECORD_SIZE_BYTES + 1:
+                return
 
-                if len(self._buffer) >= WRITE_BUFFER_SIZE:
-                    self._flush_locked()
+            self._queue.put_nowait(log_line)
 
         except Exception:
             if not FAIL_SILENTLY:
@@ -133,48 +274,169 @@ class LogWriter:
     # -----------------------------------------------------------------
 
     def flush(self) -> None:
+        """
+        Blocks until every line queued before the call is written
+        (bounded by WRITE_LOCK_TIMEOUT_SECONDS).
+        """
         if self._shutting_down:
             return
 
         try:
-            with self._lock:
-                self._flush_locked()
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                self._drain_inline()
+                return
+
+            done = threading.Event()
+            self._queue.put_nowait(done)
+            done.wait(WRITE_LOCK_TIMEOUT_SECONDS)
         except Exception:
             if not FAIL_SILENTLY:
                 raise
 
-    def _flush_locked(self) -> None:
-        if not self._buffer:
-            return
+    def _drain(self, q: queue.SimpleQueue) -> None:
+        """
+        Background drain loop. Never raises.
+        """
+        while True:
+            try:
+                stop = self._drain_batch(q, q.get())
+            except Exception:
+                # Keep the drain thread alive no matter what
+                continue
+
+            if stop:
+                return
+
+    def _drain_inline(self) -> None:
+        """
+        Drains the queue on the caller's thread (no drain thread).
+        """
+        q = self._queue
+        while True:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                return
+
+            if self._drain_batch(q, item):
+                return
+
+    def _drain_batch(self, q: queue.SimpleQueue, item: object) -> bool:
+        """
+        Collects queued lines starting with `item`, up to
+        WRITE_BUFFER_SIZE * WRITE_MAX_BATCHES_PER_WRITE of them, submits
+        them in a single write call and releases flush() waiters.
+
+        Returns True if the stop sentinel was reached.
+        """
+        lines: list[bytes] = []
+        waiters: list[threading.Event] = []
+        stop = False
+
+        while True:
+            if item is _STOP:
+                stop = True
+                break
+
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                lines.append(item)
+                if len(lines) >= _MAX_LINES_PER_WRITE:
+                    break
+
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                break
 
         try:
-            # Re-resolve file daily
-            new_file = self._resolve_log_file()
-            if self._current_file != new_file:
-                self._current_file = new_file
+            # Lines are already terminated; handed to writev() as-is
+            if lines:
+                with self._lock:
+                    self._write_buffers(lines)
+        finally:
+            for waiter in waiters:
+                waiter.set()
 
-            # Ensure directory exists (file may have been deleted)
-            self._current_file.parent.mkdir(parents=True, exist_ok=True)
+        return stop
 
-            # Pre-write rotation check
-            if ENABLE_ROTATION:
-                rotate_if_needed(self._current_file)
+    def _write_buffers(self, buffers: list[bytes]) -> None:
+        try:
+            # Re-resolve file daily
+            self._current_file = self._resolve_log_file()
 
-            # Write buffer
-            with open(self._current_file, "a", encoding="utf-8") as f:
-                for line in self._buffer:
-                    f.write(line)
-                    f.write("\n")
+            fd = self._open_fd()
 
-            # Post-write safety check
-            if ENABLE_ROTATION:
+            # Rotate only once the tracked size crosses the limit; the
+            # next pass rotates a file this write pushed over it.
+            if ENABLE_ROTATION and self._fd_size >= MAX_LOG_FILE_SIZE_BYTES:
+                # Never rename a file we hold open (fails on Windows)
+                self._close_fd()
                 rotate_if_needed(self._current_file)
+                fd = self._open_fd()
 
-            self._buffer.clear()
+            _write_all(fd, buffers)
+            self._fd_size += sum(map(len, buffers))
 
         except Exception:
-            # Drop buffer permanently to avoid infinite retry loops
-            self._buffer.clear()
+            # Buffers are dropped permanently to avoid infinite retry
+            # loops; the descriptor is reopened on the next batch.
+            self._close_fd()
 
-            if not FAIL_SILENTLY:
-                raise
+    # -----------------------------------------------------------------
+    # File descriptor management
+    # -----------------------------------------------------------------
+
+    def _open_fd(self) -> int:
+        """
+        Returns an O_APPEND descriptor for the current log file.
+
+        The descriptor is kept open across batches and reopened only
+        when the path changes or no longer points at the same inode
+        (deleted, or rotated by another process). The same stat
+        refreshes the tracked file size (other processes may append).
+        """
+        path = self._current_file
+        fd = self._fd
+
+        if fd is not None and self._fd_path == path:
+            try:
+                st = os.stat(path)
+                if (st.st_dev, st.st_ino) == self._fd_id:
+                    self._fd_size = st.st_size
+                    return fd
+            except OSError:
+                pass
+
+        self._close_fd()
+
+        # Ensure directory exists (it may have been deleted)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd = os.open(
+            path,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0),
+            0o644,
+        )
+        st = os.fstat(fd)
+
+        self._fd = fd
+        self._fd_path = path
+        self._fd_id = (st.st_dev, st.st_ino)
+        self._fd_size = st.st_size
+        return fd
+
+    def _close_fd(self) -> None:
+        fd = self._fd
+        self._fd = None
+        self._fd_path = None
+        self._fd_id = None
+        self._fd_size = 0
+
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
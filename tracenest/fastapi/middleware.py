@@ -12,60 +12,88 @@ SAFETY GUARANTEES:
 from __future__ import annotations
 
 import time
-import uuid
-from typing import Callable
+from os import urandom
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..logger import logger
-from ..core.config import FASTAPI_EXCLUDED_PATHS
+from ..core.config import FASTAPI_EXCLUDED_PATHS, FASTAPI_EXCLUDED_PREFIXES
 
 
-class TraceNestMiddleware(BaseHTTPMiddleware):
+def _new_trace_id() -> str:
     """
-    Automatic request logging middleware for FastAPI.
+    128-bit random request id as 32 hex chars (same shape as uuid4().hex).
+
+    Straight from os.urandom, which is what secrets.token_hex wraps.
     """
+    return urandom(16).hex()
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        path = request.url.path
 
-        # Skip excluded paths (UI, health checks, etc.)
-        if path in FASTAPI_EXCLUDED_PATHS:
-            return await call_next(request)
+class TraceNestMiddleware:
+    """
+    Automatic request logging middleware for FastAPI.
 
-        trace_id = uuid.uuid4().hex
-        start_time = time.perf_counter()
+    Implemented as a pure ASGI middleware: no extra task per request,
+    no Request/Response wrappers, and the response body is streamed
+    through untouched. Only the status code is observed.
+    """
 
-        try:
-            response = await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-            duration_ms = (time.perf_counter() - start_time) * 1000
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-            logger.info(
-                "HTTP request completed",
-                method=request.method,
-                path=path,
-                status_code=response.status_code,
-                duration_ms=round(duration_ms, 2),
-                client=request.client.host if request.client else None,
-                trace_id=trace_id,
-            )
+        path = scope.get("path", "")
 
-            return response
+        # Skip excluded paths (UI, health checks, etc.)
+        if path in FASTAPI_EXCLUDED_PATHS or path.startswith(
+            FASTAPI_EXCLUDED_PREFIXES
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = _new_trace_id()
+        start_ns = time.perf_counter_ns()
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        method = scope.get("method")
+        client = scope.get("client")
+        client_host = client[0] if client else None
 
-        except Exception as exc:
-            duration_ms = (time.perf_counter() - start_time) * 1000
+        try:
+            await self.app(scope, receive, send_wrapper)
 
-            logger.error(
+        except Exception as exc:
+            logger.log(
+                "ERROR",
                 "HTTP request failed",
-                method=request.method,
+                method=method,
                 path=path,
-                duration_ms=round(duration_ms, 2),
-                client=request.client.host if request.client else None,
+                duration_us=(time.perf_counter_ns() - start_ns) // 1_000,
+                client=client_host,
                 trace_id=trace_id,
                 exception=exc,
             )
 
             # Re-raise so FastAPI can handle it
             raise
+
+        logger.log(
+            "INFO",
+            "HTTP request completed",
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_us=(time.perf_counter_ns() - start_ns) // 1_000,
+            client=client_host,
+            trace_id=trace_id,
+        )
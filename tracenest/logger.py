@@ -20,9 +20,10 @@ from typing import Any, Dict, Optional
 from .core.config import (
     LOG_LEVELS,
     DEFAULT_LOG_LEVEL,
+    MIN_LOG_LEVEL,
     FAIL_SILENTLY,
 )
-from .core.formatter import format_log
+from .core.formatter import _format_log_bytes
 
 # =====================================================================
 # Internal safety guards
@@ -59,14 +60,35 @@ _LEVEL_ALIASES = {
 }
 
 
+# Every canonical level and alias, upper- and lower-case, resolved
+# at import so the common case is a single dict lookup.
+_LEVEL_MAP: Dict[str, str] = {}
+for _name in LOG_LEVELS:
+    _LEVEL_MAP[_name] = _LEVEL_MAP[_name.lower()] = _name
+for _alias, _name in _LEVEL_ALIASES.items():
+    _LEVEL_MAP[_alias] = _LEVEL_MAP[_alias.lower()] = _name
+del _name, _alias
+
+
+# Levels at or above MIN_LOG_LEVEL; anything else is dropped up front
+_ENABLED_LEVELS = frozenset(
+    name
+    for name, value in LOG_LEVELS.items()
+    if value >= LOG_LEVELS.get(MIN_LOG_LEVEL, 0)
+)
+
+
 def _normalize_level(level: Any) -> str:
     """
     Converts arbitrary developer input into a valid log level.
     """
     try:
-        lvl = str(level).upper()
-        lvl = _LEVEL_ALIASES.get(lvl, lvl)
-        return lvl if lvl in LOG_LEVELS else DEFAULT_LOG_LEVEL
+        lvl = _LEVEL_MAP.get(level)
+        if lvl is not None:
+            return lvl
+
+        # Slow path: mixed case or non-str input
+        return _LEVEL_MAP.get(str(level).upper(), DEFAULT_LOG_LEVEL)
     except Exception:
         return DEFAULT_LOG_LEVEL
 
@@ -127,6 +149,7 @@ def _log(
     exc_info: bool = False,
     include_source: bool = False,
     trace_id: Optional[str] = None,
+    get_writer: Any = _get_writer,  # the calling Logger's accessor
 ) -> None:
     """
     Internal logging entry point.
@@ -138,6 +161,10 @@ def _log(
     if _IS_SHUTTING_DOWN:
         return
 
+    normalized_level = _normalize_level(level)
+    if normalized_level not in _ENABLED_LEVELS:
+        return
+
     # Prevent recursive logging
     if getattr(_thread_state, "in_log", False):
         return
@@ -145,16 +172,15 @@ def _log(
     try:
         _thread_state.in_log = True
 
-        normalized_level = _normalize_level(level)
         normalized_metadata = _normalize_metadata(metadata)
 
         # exc_info=True support
         if exc_info and exception is None:
             exception = sys.exc_info()[1]
 
-        log_line = format_log(
+        log_line = _format_log_bytes(
             level=normalized_level,
-            message=str(message),
+            message=message,
             metadata=normalized_metadata,
             include_source=include_source,
             exception=exception,
@@ -164,7 +190,7 @@ def _log(
         if not log_line:
             return
 
-        writer = _get_writer()
+        writer = get_writer()
         if writer:
             writer.write(log_line)
         # else: intentionally drop
@@ -186,16 +212,41 @@ class Logger:
     Public Logger Interface.
 
     This class is intentionally minimal and stable.
+
+    Each instance resolves its writer through its own accessor, so a
+    logger can be pointed at another writer without touching the
+    module (the test suite's capture writer is installed this way).
+    __slots__ keeps that accessor the only instance attribute.
     """
 
+    __slots__ = ("_get_writer",)
+
+    def __init__(self) -> None:
+        self._get_writer = _get_writer
+
     def debug(self, message: Any, **metadata: Any) -> None:
-        _log(level="DEBUG", message=message, metadata=metadata)
+        _log(
+            level="DEBUG",
+            message=message,
+            metadata=metadata,
+            get_writer=self._get_writer,
+        )
 
     def info(self, message: Any, **metadata: Any) -> None:
-        _log(level="INFO", message=message, metadata=metadata)
+        _log(
+            level="INFO",
+            message=message,
+            metadata=metadata,
+            get_writer=self._get_writer,
+        )
 
     def warning(self, message: Any, **metadata: Any) -> None:
-        _log(level="WARNING", message=message, metadata=metadata)
+        _log(
+            level="WARNING",
+            message=message,
+            metadata=metadata,
+            get_writer=self._get_writer,
+        )
 
     def error(
         self,
@@ -211,6 +262,7 @@ class Logger:
             metadata=metadata,
             exception=exception,
             exc_info=exc_info,
+            get_writer=self._get_writer,
         )
 
     def critical(
@@ -227,6 +279,7 @@ class Logger:
             metadata=metadata,
             exception=exception,
             exc_info=exc_info,
+            get_writer=self._get_writer,
         )
 
     def log(
@@ -252,9 +305,28 @@ class Logger:
             exc_info=exc_info,
             include_source=include_source,
             trace_id=trace_id,
+            get_writer=self._get_writer,
         )
 
 
+def _disabled(self: Logger, message: Any, **metadata: Any) -> None:
+    """
+    Stands in for level methods below MIN_LOG_LEVEL: no work at all.
+    """
+
+
+for _method, _level in (
+    ("debug", "DEBUG"),
+    ("info", "INFO"),
+    ("warning", "WARNING"),
+    ("error", "ERROR"),
+    ("critical", "CRITICAL"),
+):
+    if _level not in _ENABLED_LEVELS:
+        setattr(Logger, _method, _disabled)
+del _method, _level
+
+
 # =====================================================================
 # Public singleton
 # =====================================================================
@@ -1,10 +1,40 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import re
+import stat
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
+import anyio
+import anyio.to_thread
 from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
+from fastapi.staticfiles import StaticFiles
+
+try:
+    import orjson
+except ImportError:  # JSONResponse falls back to its stdlib render
+    orjson = None
 
 # ─────────────────────────────────────────────
 # Paths (STRICTLY MATCH PROJECT STRUCTURE)
@@ -13,9 +43,37 @@ from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
 BASE_DIR = Path.cwd()
 LOG_DIR = BASE_DIR / "TraceNestLogs"
 
+# Plain-string form for per-request joins (no pathlib objects)
+_LOG_DIR_STR = os.fspath(LOG_DIR)
+
 UI_DIR = Path(__file__).parent
 TEMPLATES_DIR = UI_DIR / "templates"
 
+# Log file names the API will open (checked before any I/O)
+_LOG_FILENAME_RE = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9._-]{0,127}\.log")
+
+# Block size for reading log tails backwards from EOF; each further
+# block doubles, up to the max, so long tails take few reads.
+_TAIL_BLOCK_SIZE = 64 * 1024
+_TAIL_MAX_BLOCK_SIZE = 1024 * 1024
+
+# Open descriptors kept for recently read log files; one unused for
+# longer is closed (by a timer while any are cached), so a deleted
+# log's space is not held for good.
+_FD_CACHE_SIZE = 32
+_FD_CACHE_MAX_IDLE_NS = 30 * 1_000_000_000
+
+# Worker threads available to UI file I/O
+_IO_THREADS = 4
+
+# Target body chunk size for streamed log tails
+_STREAM_CHUNK_SIZE = 16 * 1024
+
+# Encoded tail responses are reused for this long (tabs poll in step),
+# within a total byte budget
+_TAIL_CACHE_TTL_NS = 250_000_000
+_TAIL_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
 # ─────────────────────────────────────────────
 # Router
 # ─────────────────────────────────────────────
@@ -34,74 +92,527 @@ def _ensure_log_dir() -> None:
         pass
 
 
+# (directory mtime_ns, sorted names, encoded /api/logs body) of the
+# last scan. The directory mtime changes whenever a file is added,
+# removed or renamed.
+_LIST_CACHE: Optional[Tuple[int, List[str], bytes]] = None
+_LIST_CACHE_LOCK = threading.Lock()
+
+
 def _list_log_files() -> List[str]:
-    _ensure_log_dir()
+    """
+    Sorted (newest first) log file names. The returned list is shared
+    with the cache and must not be mutated.
+    """
+    listing = _log_listing()
+    return listing[1] if listing is not None else []
+
+
+def _list_logs_body() -> bytes:
+    """
+    Encoded /api/logs response, re-encoded only when the directory
+    changes.
+    """
+    listing = _log_listing()
+    return listing[2] if listing is not None else b'{"logs":[]}'
+
+
+def _log_listing() -> Optional[Tuple[int, List[str], bytes]]:
+    global _LIST_CACHE
+
     try:
-        return sorted(
-            [f.name for f in LOG_DIR.iterdir() if f.is_file() and f.suffix == ".log"],
-            reverse=True,
-        )
+        try:
+            mtime = os.stat(_LOG_DIR_STR).st_mtime_ns
+        except FileNotFoundError:
+            _ensure_log_dir()
+            mtime = os.stat(_LOG_DIR_STR).st_mtime_ns
+
+        cached = _LIST_CACHE
+        if cached is not None and cached[0] == mtime:
+            return cached
+
+        with _LIST_CACHE_LOCK:
+            cached = _LIST_CACHE
+            if cached is not None and cached[0] == mtime:
+                return cached
+
+            names = sorted(_iter_log_names(), reverse=True)
+            body = _JSONResponse({"logs": names}).body
+
+            _LIST_CACHE = (mtime, names, body)
+            return _LIST_CACHE
     except Exception:
-        return []
+        return None
+
+
+def _iter_log_names() -> Iterator[str]:
+    # Only names the tail endpoints will serve; the name check comes
+    # first, and is_file() comes from the scan (no stat)
+    match = _LOG_FILENAME_RE.fullmatch
+    with os.scandir(_LOG_DIR_STR) as entries:
+        for entry in entries:
+            name = entry.name
+            if match(name) is not None and entry.is_file(follow_symlinks=False):
+                yield name
 
 
 def _read_log_file(filename: str, limit: int = 500) -> List[str]:
-    path = LOG_DIR / filename
-    if not path.exists() or not path.is_file():
+    return [
+        line.decode("utf-8", "ignore")
+        for line in _read_log_tail(filename, limit)
+    ]
+
+
+def _read_log_tail(filename: str, limit: int) -> List[bytes]:
+    """
+    Raw (undecoded) tail lines of a log file; [] if unavailable.
+    """
+    # Pure-CPU allowlist first: no separators, so no traversal
+    if _LOG_FILENAME_RE.fullmatch(filename) is None:
+        return []
+
+    path = os.path.join(_LOG_DIR_STR, filename)
+
+    try:
+        # One stat feeds the type check, fd cache and tail size.
+        # Regular files only; a symlink could point outside LOG_DIR.
+        try:
+            st: Optional[os.stat_result] = os.lstat(path)
+        except FileNotFoundError:
+            st = None
+
+        if st is None or not stat.S_ISREG(st.st_mode):
+            # Deleted or replaced: stop holding the old file open
+            _drop_log_fd(filename)
+            return []
+
+        fd = _open_log_fd(filename, path, st)
+        try:
+            return _tail_lines(fd, st.st_size, limit)
+        finally:
+            os.close(fd)
+    except Exception:
         return []
 
+
+# ─────────────────────────────────────────────
+# Open log file cache
+# ─────────────────────────────────────────────
+
+# filename -> (fd, (st_dev, st_ino), last use monotonic_ns), least
+# recently used first. Polling re-reads the same few files; a cached
+# descriptor skips the path lookup of open(). POSIX only: reads use
+# pread(), which never touches the shared file offset.
+_FD_CACHE: OrderedDict[str, Tuple[int, Tuple[int, int], int]] = OrderedDict()
+_FD_CACHE_LOCK = threading.Lock()
+_FD_CACHE_ENABLED = hasattr(os, "pread")
+
+# Closes idle descriptors when no further request arrives to do it
+_FD_SWEEP_TIMER: Optional[threading.Timer] = None
+
+
+def _open_log_fd(filename: str, path: str, st: os.stat_result) -> int:
+    """
+    Returns a read-only descriptor for path; the caller closes it.
+
+    Cached descriptors are handed out as dup()s, so eviction never
+    closes a descriptor another request is still reading. Entries are
+    replaced when the path no longer points at the cached inode
+    (rotated or recreated).
+    """
+    if not _FD_CACHE_ENABLED:
+        return os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+
+    file_id = (st.st_dev, st.st_ino)
+    now = time.monotonic_ns()
+
+    with _FD_CACHE_LOCK:
+        _close_idle_fds(now)
+
+        cached = _FD_CACHE.pop(filename, None)
+        if cached is not None:
+            if cached[1] == file_id:
+                _FD_CACHE[filename] = (cached[0], file_id, now)
+                return os.dup(cached[0])
+
+            os.close(cached[0])
+
+        fd = os.open(path, os.O_RDONLY)
+
+        # Verify what was opened is what was checked (no swap race)
+        opened = os.fstat(fd)
+        if (opened.st_dev, opened.st_ino) != file_id:
+            os.close(fd)
+            raise FileNotFoundError(path)
+
+        _FD_CACHE[filename] = (fd, file_id, now)
+        while len(_FD_CACHE) > _FD_CACHE_SIZE:
+            _, (old_fd, _, _) = _FD_CACHE.popitem(last=False)
+            os.close(old_fd)
+
+        _schedule_fd_sweep()
+        return os.dup(fd)
+
+
+def _schedule_fd_sweep() -> None:
+    # Caller holds _FD_CACHE_LOCK. A timer inherited across fork()
+    # is not running in the child, hence the is_alive() check.
+    global _FD_SWEEP_TIMER
+
+    timer = _FD_SWEEP_TIMER
+    if timer is not None and timer.is_alive():
+        return
+
+    timer = threading.Timer(_FD_CACHE_MAX_IDLE_NS / 1e9, _sweep_idle_fds)
+    timer.daemon = True
+    timer.start()
+    _FD_SWEEP_TIMER = timer
+
+
+def _sweep_idle_fds() -> None:
+    global _FD_SWEEP_TIMER
+
     try:
-        with path.open("r", encoding="utf-8", errors="ignore") as f:
-            return f.readlines()[-limit:]
+        with _FD_CACHE_LOCK:
+            _FD_SWEEP_TIMER = None
+            _close_idle_fds(time.monotonic_ns())
+            if _FD_CACHE:
+                _schedule_fd_sweep()
     except Exception:
+        pass
+
+
+def _close_idle_fds(now: int) -> None:
+    # Caller holds _FD_CACHE_LOCK. LRU order: idle entries come first.
+    while _FD_CACHE:
+        filename, (fd, _, last_used) = next(iter(_FD_CACHE.items()))
+        if now - last_used < _FD_CACHE_MAX_IDLE_NS:
+            return
+        del _FD_CACHE[filename]
+        os.close(fd)
+
+
+def _drop_log_fd(filename: str) -> None:
+    """
+    Closes the cached descriptor of a log file that was deleted or
+    replaced, so its disk space is released.
+    """
+    with _FD_CACHE_LOCK:
+        cached = _FD_CACHE.pop(filename, None)
+    if cached is not None:
+        os.close(cached[0])
+
+
+# ─────────────────────────────────────────────
+# Tail reading
+# ─────────────────────────────────────────────
+
+
+def _tail_lines(fd: int, size: int, limit: int) -> List[bytes]:
+    """
+    Last `limit` lines of the first `size` bytes of the file, like
+    readlines()[-limit:] in binary mode. Cost scales with the tail
+    size, not the file size.
+
+    Read with pread() in blocks backwards from EOF. The file is never
+    memory-mapped: the active day's log may be truncated by another
+    process, and touching mapped pages past the new end raises SIGBUS
+    in the whole host process.
+    """
+    if limit <= 0 or size <= 0:
         return []
 
+    return _tail_blocks(fd, size, limit)
+
+
+def _tail_blocks(fd: int, size: int, limit: int) -> List[bytes]:
+    chunks: List[bytes] = []
+    newlines = 0
+    pos = size
+    block = _TAIL_BLOCK_SIZE
+
+    # limit + 1 newlines guarantee the first kept line is whole
+    while pos > 0 and newlines <= limit:
+        step = min(block, pos)
+        pos -= step
+        chunk = _read_at(fd, step, pos)
+        chunks.append(chunk)
+        newlines += chunk.count(b"\n")
+        block = min(block * 2, _TAIL_MAX_BLOCK_SIZE)
+
+    chunks.reverse()
+    return _split_tail(b"".join(chunks), pos > 0, limit)
+
+
+def _read_at(fd: int, size: int, offset: int) -> bytes:
+    if _FD_CACHE_ENABLED:
+        return os.pread(fd, size, offset)
+
+    # Uncached descriptors are private to the caller
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def _split_tail(data: bytes, partial: bool, limit: int) -> List[bytes]:
+    """
+    Splits tail bytes into readlines()-style lines; `partial` means
+    the first line was cut and is dropped.
+    """
+    parts = data.split(b"\n")
+
+    lines = [part + b"\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+
+    if partial:
+        lines = lines[1:]
+
+    return lines[-limit:]
+
+
+# ─────────────────────────────────────────────
+# Blocking I/O offload
+# ─────────────────────────────────────────────
+
+# Dedicated limiter: UI file reads never take threads from the host
+# app's default pool (and its size is never changed from here).
+_IO_LIMITER: Optional[anyio.CapacityLimiter] = None
+
+T = TypeVar("T")
+
+
+async def _run_io(func: Callable[..., T], *args: Any) -> T:
+    global _IO_LIMITER
+
+    if _IO_LIMITER is None:
+        _IO_LIMITER = anyio.CapacityLimiter(_IO_THREADS)
+
+    return await anyio.to_thread.run_sync(func, *args, limiter=_IO_LIMITER)
+
 
 # ─────────────────────────────────────────────
 # UI ROUTES (FILES SERVED EXPLICITLY)
 # ─────────────────────────────────────────────
 
+# Templates served with ETag / Last-Modified and 304 revalidation.
+# APIRouter.mount() would be dropped by include_router(), so a path
+# route delegates to StaticFiles instead.
+_ASSETS = StaticFiles(directory=TEMPLATES_DIR)
+
+# Asset names are not content-hashed: cache, but always revalidate
+_ASSET_CACHE_CONTROL = "no-cache"
+
+
+async def _serve_template(path: str, request: Request) -> Response:
+    response = await _ASSETS.get_response(path, request.scope)
+    response.headers["Cache-Control"] = _ASSET_CACHE_CONTROL
+    return response
+
+
+def _load_index() -> Tuple[Optional[bytes], str]:
+    try:
+        data = (TEMPLATES_DIR / "index.html").read_bytes()
+    except OSError:
+        return None, ""
+    return data, '"' + hashlib.blake2b(data, digest_size=8).hexdigest() + '"'
+
+
+# The HTML shell never changes at runtime: read and hashed once
+_INDEX_BYTES, _INDEX_ETAG = _load_index()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 @router.get("/", response_class=HTMLResponse)
-def tracenest_ui(request: Request):
+async def tracenest_ui(request: Request):
     """
     Main TraceNest UI entry point.
     """
-    try:
-        return (TEMPLATES_DIR / "index.html").read_text(encoding="utf-8")
-    except Exception:
-        return "<h1>TraceNest UI failed to load</h1>"
+    if _INDEX_BYTES is None:
+        return HTMLResponse("<h1>TraceNest UI failed to load</h1>")
 
+    headers = {"ETag": _INDEX_ETAG, "Cache-Control": _ASSET_CACHE_CONTROL}
+    if _etag_matches(request, _INDEX_ETAG):
+        return Response(status_code=304, headers=headers)
 
-@router.get("/app.js")
-def tracenest_app_js():
-    return FileResponse(
-        TEMPLATES_DIR / "app.js",
-        media_type="application/javascript",
-    )
+    return HTMLResponse(_INDEX_BYTES, headers=headers)
 
 
-@router.get("/styles.css")
-def tracenest_styles_css():
-    return FileResponse(
-        TEMPLATES_DIR / "styles.css",
-        media_type="text/css",
-    )
+@router.get("/assets/{path:path}")
+async def tracenest_asset(path: str, request: Request):
+    return await _serve_template(path, request)
 
 
 # ─────────────────────────────────────────────
 # API ROUTES
 # ─────────────────────────────────────────────
 
+class _JSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson when installed (log tails are
+    string-heavy, the stdlib encoder's slowest case).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(content)
+            except TypeError:
+                pass
+        return super().render(content)
+
+
 @router.get("/api/logs")
-def list_logs():
-    return JSONResponse({"logs": _list_log_files()})
+async def list_logs():
+    body = await _run_io(_list_logs_body)
+    return Response(body, media_type="application/json")
 
 
 @router.get("/api/logs/{filename}")
-def get_log_file(filename: str, limit: int = 500):
-    return JSONResponse(
+async def get_log_file(filename: str, limit: int = 500):
+    body = await _get_tail_body(filename, limit)
+    return Response(body, media_type="application/json")
+
+
+def _render_log_file(filename: str, limit: int) -> bytes:
+    lines = _read_log_file(filename, limit)
+    return _JSONResponse(
         {
             "file": filename,
-            "lines": _read_log_file(filename, limit),
+            "lines": lines,
         }
+    ).body
+
+
+# (filename, limit) -> (expiry monotonic_ns, encoded body), oldest
+# first. The TTL is fixed, so entries also expire in this order.
+# Only touched from the event loop: no lock.
+_TAIL_CACHE: OrderedDict[Tuple[str, int], Tuple[int, bytes]] = OrderedDict()
+_TAIL_CACHE_BYTES = 0
+
+
+class _TailRead:
+    """
+    A tail read in progress, shared by identical concurrent requests.
+    """
+
+    __slots__ = ("done", "body")
+
+    def __init__(self) -> None:
+        self.done = anyio.Event()
+        self.body: Optional[bytes] = None
+
+
+_TAIL_INFLIGHT: Dict[Tuple[str, int], _TailRead] = {}
+
+
+async def _get_tail_body(filename: str, limit: int) -> bytes:
+    """
+    Encoded tail response. Concurrent identical requests share a
+    single read, and its result is served for _TAIL_CACHE_TTL_NS, so
+    N polling clients cost one read and one encode per interval.
+    """
+    # Rejected names never reach the I/O pool or the cache
+    if _LOG_FILENAME_RE.fullmatch(filename) is None:
+        return _JSONResponse({"file": filename, "lines": []}).body
+
+    key = (filename, limit)
+
+    cached = _TAIL_CACHE.get(key)
+    if cached is not None:
+        if time.monotonic_ns() < cached[0]:
+            return cached[1]
+        _evict_tail(key)
+
+    pending = _TAIL_INFLIGHT.get(key)
+    if pending is not None:
+        await pending.done.wait()
+        if pending.body is not None:
+            return pending.body
+        # The shared read failed or was cancelled: read independently
+        return await _run_io(_render_log_file, filename, limit)
+
+    read = _TailRead()
+    _TAIL_INFLIGHT[key] = read
+    try:
+        body = await _run_io(_render_log_file, filename, limit)
+        read.body = body
+        _cache_tail(key, body)
+
+        return body
+    finally:
+        del _TAIL_INFLIGHT[key]
+        read.done.set()
+
+
+def _cache_tail(key: Tuple[str, int], body: bytes) -> None:
+    global _TAIL_CACHE_BYTES
+
+    if len(body) > _TAIL_CACHE_MAX_BYTES:
+        return
+
+    now = time.monotonic_ns()
+
+    # Expired entries first, then the oldest until the body fits
+    while _TAIL_CACHE:
+        oldest, (expiry, _) = next(iter(_TAIL_CACHE.items()))
+        if (
+            expiry > now
+            and _TAIL_CACHE_BYTES + len(body) <= _TAIL_CACHE_MAX_BYTES
+        ):
+            break
+        _evict_tail(oldest)
+
+    _evict_tail(key)
+    _TAIL_CACHE[key] = (now + _TAIL_CACHE_TTL_NS, body)
+    _TAIL_CACHE_BYTES += len(body)
+
+
+def _evict_tail(key: Tuple[str, int]) -> None:
+    global _TAIL_CACHE_BYTES
+
+    cached = _TAIL_CACHE.pop(key, None)
+    if cached is not None:
+        _TAIL_CACHE_BYTES -= len(cached[1])
+
+
+@router.get("/api/logs/{filename}/stream")
+async def stream_log_file(filename: str, limit: int = 500):
+    """
+    Same tail as /api/logs/{filename}, streamed as raw text lines:
+    no decoded line list, no JSON encoding.
+    """
+    if _LOG_FILENAME_RE.fullmatch(filename) is None:
+        lines: List[bytes] = []
+    else:
+        lines = await _run_io(_read_log_tail, filename, limit)
+
+    return StreamingResponse(
+        _iter_chunks(lines),
+        media_type="text/plain; charset=utf-8",
     )
+
+
+async def _iter_chunks(lines: List[bytes]) -> AsyncIterator[bytes]:
+    chunk: List[bytes] = []
+    size = 0
+
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= _STREAM_CHUNK_SIZE:
+            yield b"".join(chunk)
+            chunk = []
+            size = 0
+
+    if chunk:
+        yield b"".join(chunk)
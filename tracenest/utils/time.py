@@ -0,0 +1,43 @@
+"""
+TraceNest Time Helpers
+
+Date formatting shared by the writer and retention.
+
+Pure helpers: no I/O, no state beyond small caches.
+"""
+
+from __future__ import annotations
+
+import time
+
+from ..core.config import LOG_FILE_DATE_FORMAT, LOG_FILE_EXTENSION
+
+_SECONDS_PER_DAY = 86_400
+
+# (epoch_day, "YYYY-MM-DD.log") of the last UTC day seen; same
+# single-tuple rebinding as formatter._TS_CACHE.
+_DAY_CACHE: tuple[int, str] = (-1, "")
+
+
+def today_log_file_name() -> str:
+    """
+    Returns today's (UTC) day-wise log file name.
+
+    Formatted once per UTC day; every other call is one integer
+    division and a tuple compare. Rolls over exactly at midnight.
+    """
+    global _DAY_CACHE
+
+    day = int(time.time()) // _SECONDS_PER_DAY
+
+    cached = _DAY_CACHE
+    if cached[0] == day:
+        return cached[1]
+
+    date_str = time.strftime(
+        LOG_FILE_DATE_FORMAT, time.gmtime(day * _SECONDS_PER_DAY)
+    )
+    name = f"{date_str}{LOG_FILE_EXTENSION}"
+
+    _DAY_CACHE = (day, name)
+    return name